@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import List
 
 
 class Settings(BaseSettings):
@@ -9,23 +10,29 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = False
+    cors_origins: List[str] = []  # JSON list, e.g. ["https://example.com"]; empty disables CORS
     
     # Supabase Configuration
     supabase_url: str = ""
     supabase_key: str = ""  # Service role key for server-side access
+    supabase_shared_at_column: str = ""  # Optional job_posts column stamped when a job is shared
     
     # Telegram Configuration
     telegram_bot_token: str = ""
     telegram_channel_id: str = ""
+    telegram_max_concurrent_posts: int = 5  # Parallel sends per check
     
     # Redis Configuration
     redis_url: str = "redis://localhost:6379/0"
     
     # Job Site Configuration
     job_site_url: str = "https://flexi-task-zeta.vercel.app"
+    cloudinary_image_base_url: str = "https://res.cloudinary.com/dqxfwbv1j/image/upload/f_auto,q_auto/"  # Prefix for bare jobImageUrl paths
     
     # Polling Configuration
     polling_interval_seconds: int = 60  # How often to check for new jobs
+    max_polling_interval_seconds: int = 600  # Upper bound when backing off while idle
+    scheduler_persist_jobs: bool = False  # Keep scheduler state in Redis across restarts
     
     class Config:
         env_file = ".env"
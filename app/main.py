@@ -13,16 +13,32 @@ Features:
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from typing import Optional
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+import asyncio
 import logging
 
-from app.models import JobPosting, PostResponse, JobMonitorStatus
+from app.models import (
+    JobPosting,
+    NewJobsResponse,
+    JobDetailResponse,
+    SharedJobsResponse,
+    HealthResponse,
+    PostResponse,
+    JobMonitorStatus
+)
 from app.config import get_settings
-from app.services.supabase_service import SupabaseService
-from app.services.telegram_service import TelegramService
-from app.scheduler import start_scheduler, stop_scheduler, get_scheduler_status, check_and_share_new_jobs
+from app.services import get_supabase_service, get_telegram_service
+from app.scheduler import (
+    start_scheduler,
+    stop_scheduler,
+    get_scheduler_status,
+    check_and_share_new_jobs,
+    claim_jobs,
+    next_checkpoint
+)
 
 # Configure logging
 logging.basicConfig(
@@ -34,14 +50,13 @@ logger = logging.getLogger(__name__)
 # Get settings
 settings = get_settings()
 
-# Initialize services
-supabase_service = SupabaseService()
-telegram_service = TelegramService()
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown"""
+    supabase_service = get_supabase_service()
+    telegram_service = get_telegram_service()
+    
     # Startup
     logger.info("Starting FlexiTask Automation Server...")
     logger.info(f"Job site URL: {settings.job_site_url}")
@@ -64,6 +79,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down FlexiTask Automation Server...")
     stop_scheduler()
     await supabase_service.close()
+    await telegram_service.close()
 
 
 # Initialize FastAPI app
@@ -83,14 +99,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure based on your needs
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Configure CORS only when origins are set
+if settings.cors_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 
 # ============= Health Check Endpoints =============
@@ -106,15 +123,17 @@ async def root():
     }
 
 
-@app.get("/health", tags=["Health"])
+@app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """Detailed health check for all services"""
+    supabase_service = get_supabase_service()
+    telegram_service = get_telegram_service()
     stats = await supabase_service.get_stats()
     
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "services": {
+    return HealthResponse(
+        status="healthy",
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        services={
             "supabase": {
                 "configured": supabase_service.is_configured(),
                 "stats": stats
@@ -123,16 +142,16 @@ async def health_check():
                 "configured": telegram_service.is_configured()
             }
         },
-        "configuration": {
+        configuration={
             "polling_interval": settings.polling_interval_seconds,
             "job_site_url": settings.job_site_url
         }
-    }
+    )
 
 
 # ============= Job Monitoring Endpoints =============
 
-@app.get("/api/jobs/new", tags=["Jobs"])
+@app.get("/api/jobs/new", response_model=NewJobsResponse, tags=["Jobs"])
 async def get_new_jobs(
     hours: int = Query(default=24, description="Look back period in hours")
 ):
@@ -142,36 +161,26 @@ async def get_new_jobs(
     Returns jobs created in the last N hours that haven't been posted
     to Telegram.
     """
+    supabase_service = get_supabase_service()
+    
     if not supabase_service.is_configured():
         raise HTTPException(
             status_code=503,
             detail="Supabase service not configured"
         )
     
-    from datetime import timedelta
     since = datetime.now(timezone.utc) - timedelta(hours=hours)
     
     jobs = await supabase_service.get_new_published_jobs(since=since)
     
-    return {
-        "count": len(jobs),
-        "since": since.isoformat(),
-        "jobs": [
-            {
-                "id": job.id,
-                "title": job.title,
-                "company": job.companyName,
-                "slug": job.slug,
-                "created_at": job.createdAt.isoformat() if job.createdAt else None
-            }
-            for job in jobs
-        ]
-    }
+    return NewJobsResponse(count=len(jobs), since=since.isoformat(), jobs=jobs)
 
 
-@app.get("/api/jobs/{job_id}", tags=["Jobs"])
+@app.get("/api/jobs/{job_id}", response_model=JobDetailResponse, tags=["Jobs"])
 async def get_job(job_id: str):
     """Get details of a specific job"""
+    supabase_service = get_supabase_service()
+    
     if not supabase_service.is_configured():
         raise HTTPException(
             status_code=503,
@@ -189,23 +198,18 @@ async def get_job(job_id: str):
     # Get sharing info
     shared_info = await supabase_service.get_shared_job_info(job_id)
     
-    return {
-        "job": job.model_dump(),
-        "shared": shared_info
-    }
+    return JobDetailResponse(job=job, shared=shared_info)
 
 
-@app.get("/api/jobs/shared/recent", tags=["Jobs"])
+@app.get("/api/jobs/shared/recent", response_model=SharedJobsResponse, tags=["Jobs"])
 async def get_recently_shared_jobs(
     limit: int = Query(default=50, le=100, description="Maximum number of jobs to return")
 ):
     """Get list of recently shared jobs"""
+    supabase_service = get_supabase_service()
     jobs = await supabase_service.get_recently_shared_jobs(limit=limit)
     
-    return {
-        "count": len(jobs),
-        "jobs": jobs
-    }
+    return SharedJobsResponse(count=len(jobs), jobs=jobs)
 
 
 # ============= Manual Posting Endpoints =============
@@ -229,6 +233,22 @@ async def trigger_manual_check():
     return result
 
 
+@app.post("/api/share/trigger-check", tags=["Sharing"])
+async def trigger_job_check(background_tasks: BackgroundTasks):
+    """
+    Manually trigger a check for new jobs
+    
+    This will check for new jobs and share them in the background.
+    Useful for testing or forcing an immediate check.
+    """
+    background_tasks.add_task(check_and_share_jobs_background)
+    
+    return {
+        "message": "Job check triggered",
+        "status": "processing"
+    }
+
+
 @app.post("/api/share/{job_id}", response_model=PostResponse, tags=["Sharing"])
 async def share_job(job_id: str):
     """
@@ -236,6 +256,8 @@ async def share_job(job_id: str):
     
     Use this to manually share a job to Telegram.
     """
+    supabase_service = get_supabase_service()
+    
     if not supabase_service.is_configured():
         raise HTTPException(
             status_code=503,
@@ -277,43 +299,59 @@ async def share_job(job_id: str):
     )
 
 
-@app.post("/api/share/trigger-check", tags=["Sharing"])
-async def trigger_job_check(background_tasks: BackgroundTasks):
-    """
-    Manually trigger a check for new jobs
-    
-    This will check for new jobs and share them in the background.
-    Useful for testing or forcing an immediate check.
-    """
-    background_tasks.add_task(check_and_share_jobs_background)
-    
-    return {
-        "message": "Job check triggered",
-        "status": "processing"
-    }
-
-
 async def check_and_share_jobs_background():
     """Background task to check and share new jobs"""
+    supabase_service = get_supabase_service()
+    
     try:
-        from datetime import timedelta
+        # Checkpoint at the start so jobs created while posting are seen next run
+        check_started = datetime.now(timezone.utc)
         
         last_check = await supabase_service.get_last_check_timestamp()
         if last_check is None:
-            last_check = datetime.now(timezone.utc) - timedelta(hours=24)
+            last_check = check_started - timedelta(hours=24)
         
-        jobs = await supabase_service.get_new_published_jobs(since=last_check)
+        fetched = await supabase_service.get_new_published_jobs(since=last_check)
+        jobs = await claim_jobs(fetched, supabase_service) or []
         
-        for job in jobs:
-            result = await post_to_telegram(job)
-            if result.get("success"):
-                await supabase_service.mark_job_as_shared(
-                    job_id=job.id,
-                    telegram_shared=True,
-                    telegram_message_id=result.get("message_id")
-                )
+        # Jobs left unshared by this run; they keep the checkpoint from passing them
+        claimed_ids = {job.id for job in jobs}
+        pending = [job for job in fetched if job.id not in claimed_ids]
         
-        await supabase_service.set_last_check_timestamp()
+        # Post concurrently, bounded to stay within Telegram rate limits
+        semaphore = asyncio.Semaphore(settings.telegram_max_concurrent_posts)
+        
+        async def share_one(job: JobPosting) -> dict:
+            async with semaphore:
+                return await post_to_telegram(job)
+        
+        # One failed post must not discard the ones that already went out
+        results = await asyncio.gather(
+            *(share_one(job) for job in jobs),
+            return_exceptions=True
+        )
+        
+        # Record all successful posts in one batch
+        shared_rows = []
+        shared_jobs = []
+        for job, result in zip(jobs, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error sharing job {job.id}: {str(result) or type(result).__name__}")
+                pending.append(job)
+            elif result.get("success"):
+                shared_rows.append({
+                    "job_id": job.id,
+                    "telegram_shared": True,
+                    "telegram_message_id": result.get("message_id")
+                })
+                shared_jobs.append(job)
+            else:
+                pending.append(job)
+        
+        # Unrecorded posts stay pending, so the checkpoint is written after the batch
+        if not await supabase_service.mark_jobs_as_shared_bulk(shared_rows):
+            pending.extend(shared_jobs)
+        await supabase_service.set_last_check_timestamp(next_checkpoint(check_started, pending))
         
         logger.info(f"Background check completed. Processed {len(jobs)} jobs.")
         
@@ -323,6 +361,7 @@ async def check_and_share_jobs_background():
 
 async def post_to_telegram(job: JobPosting) -> dict:
     """Post job to Telegram"""
+    telegram_service = get_telegram_service()
     
     if not telegram_service.is_configured():
         return {"success": False, "error": "Telegram not configured"}
@@ -338,9 +377,12 @@ async def post_to_telegram(job: JobPosting) -> dict:
 
 # ============= Preview Endpoints =============
 
-@app.post("/api/preview/telegram", tags=["Preview"])
+@app.post("/api/preview/telegram", response_class=PlainTextResponse, tags=["Preview"])
 async def preview_telegram_message(job_id: str):
     """Preview what the Telegram message will look like"""
+    supabase_service = get_supabase_service()
+    telegram_service = get_telegram_service()
+    
     job = await supabase_service.get_job_by_id(job_id)
     
     if not job:
@@ -348,11 +390,10 @@ async def preview_telegram_message(job_id: str):
     
     message = telegram_service.format_job_message(job)
     
-    return {
-        "platform": "telegram",
-        "job_id": job_id,
-        "formatted_message": message
-    }
+    return PlainTextResponse(
+        message,
+        headers={"X-Job-Id": job_id, "X-Platform": "telegram"}
+    )
 
 
 # ============= Statistics Endpoints =============
@@ -360,6 +401,7 @@ async def preview_telegram_message(job_id: str):
 @app.get("/api/stats", tags=["Statistics"])
 async def get_statistics():
     """Get sharing statistics"""
+    supabase_service = get_supabase_service()
     stats = await supabase_service.get_stats()
     
     return {
@@ -374,5 +416,7 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug
+        reload=settings.debug,
+        loop="uvloop",
+        http="httptools"
     )
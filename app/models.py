@@ -1,24 +1,24 @@
-from pydantic import BaseModel, HttpUrl
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class EmploymentType(str, Enum):
+class EmploymentType(StrEnum):
     """Employment type enum matching FlexiTask database"""
     FULL_TIME = "FULL_TIME"
     PART_TIME = "PART_TIME"
     CONTRACT = "CONTRACT"
 
 
-class WorkLocationType(str, Enum):
+class WorkLocationType(StrEnum):
     """Work location type enum matching FlexiTask database"""
     ONSITE = "ONSITE"
     REMOTE = "REMOTE"
     HYBRID = "HYBRID"
 
 
-class ExperienceYears(str, Enum):
+class ExperienceYears(StrEnum):
     """Experience years enum matching FlexiTask database"""
     ONE_PLUS = "ONE_PLUS"
     TWO_PLUS = "TWO_PLUS"
@@ -48,6 +48,26 @@ class City(BaseModel):
 
 class JobPosting(BaseModel):
     """Job posting data model matching FlexiTask database structure"""
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
+            "example": {
+                "id": "clx1234567890",
+                "title": "Senior Software Engineer",
+                "slug": "senior-software-engineer-techcorp",
+                "companyName": "TechCorp Inc.",
+                "employmentType": "FULL_TIME",
+                "workLocationType": "HYBRID",
+                "isInternship": False,
+                "uniqueDescription": "We are looking for a talented engineer...",
+                "linkedInApplyURL": "https://www.linkedin.com/jobs/view/123456789",
+                "isPublished": True,
+                "experienceYears": "TWO_PLUS"
+            }
+        }
+    )
+    
     id: str
     title: str
     slug: str
@@ -71,22 +91,14 @@ class JobPosting(BaseModel):
     country: Optional[Country] = None
     city: Optional[City] = None
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "clx1234567890",
-                "title": "Senior Software Engineer",
-                "slug": "senior-software-engineer-techcorp",
-                "companyName": "TechCorp Inc.",
-                "employmentType": "FULL_TIME",
-                "workLocationType": "HYBRID",
-                "isInternship": False,
-                "uniqueDescription": "We are looking for a talented engineer...",
-                "linkedInApplyURL": "https://www.linkedin.com/jobs/view/123456789",
-                "isPublished": True,
-                "experienceYears": "TWO_PLUS"
-            }
-        }
+    @classmethod
+    def from_supabase_row(cls, row: Dict[str, Any]) -> "JobPosting":
+        """Build a JobPosting from a job_posts row with its embedded relations"""
+        data = dict(row)
+        data["category"] = data.pop("job_categories", None)
+        data["country"] = data.pop("countries", None)
+        data["city"] = data.pop("cities", None)
+        return cls.model_validate(data)
 
 
 class SharedJob(BaseModel):
@@ -98,6 +110,44 @@ class SharedJob(BaseModel):
     error_message: Optional[str] = None
 
 
+class JobSummary(BaseModel):
+    """Lightweight projection of a JobPosting for listings"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: str
+    title: str
+    company: str = Field(validation_alias="companyName")
+    slug: str
+    created_at: Optional[datetime] = Field(default=None, validation_alias="createdAt")
+
+
+class NewJobsResponse(BaseModel):
+    """Response model for the new jobs listing"""
+    count: int
+    since: str
+    jobs: List[JobSummary]
+
+
+class JobDetailResponse(BaseModel):
+    """Response model for a single job with its sharing info"""
+    job: JobPosting
+    shared: Optional[Dict[str, Any]] = None
+
+
+class SharedJobsResponse(BaseModel):
+    """Response model for recently shared jobs"""
+    count: int
+    jobs: List[Dict[str, Any]]
+
+
+class HealthResponse(BaseModel):
+    """Response model for the health check"""
+    status: str
+    timestamp: str
+    services: Dict[str, Any]
+    configuration: Dict[str, Any]
+
+
 class PostResponse(BaseModel):
     """Response model for job posting"""
     success: bool
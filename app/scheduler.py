@@ -6,24 +6,98 @@ Runs the job check task on a configurable interval.
 """
 
 import asyncio
+import math
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from app.config import get_settings
-from app.services.supabase_service import SupabaseService
-from app.services.telegram_service import TelegramService
+from app.services import (
+    SupabaseService,
+    TelegramService,
+    get_supabase_service,
+    get_telegram_service
+)
 from app.models import JobPosting
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+
+def _build_jobstores() -> Dict[str, Any]:
+    """Use a Redis job store when persistence is enabled, else the in-memory default"""
+    if not settings.scheduler_persist_jobs:
+        return {}
+    
+    from apscheduler.jobstores.redis import RedisJobStore
+    from redis.connection import SSLConnection, parse_url
+    
+    # Same URL handling as the service's Redis.from_url (percent-decoding,
+    # query options); Redis() takes ssl=True rather than a connection class
+    connect_args = parse_url(settings.redis_url)
+    connection_class = connect_args.pop("connection_class", None)
+    if connection_class is not None and issubclass(connection_class, SSLConnection):
+        connect_args["ssl"] = True
+    return {"default": RedisJobStore(**connect_args)}
+
+
 # Global scheduler instance
-scheduler = AsyncIOScheduler()
+scheduler = AsyncIOScheduler(
+    jobstores=_build_jobstores(),
+    job_defaults={
+        "coalesce": True,  # Collapse missed runs into one
+        "misfire_grace_time": 60,
+        "max_instances": 1  # Prevent overlapping runs
+    }
+)
 
-settings = get_settings()
+# Polling backs off by this factor after each check that finds no jobs
+POLLING_BACKOFF_FACTOR = 1.5
+_current_interval = settings.polling_interval_seconds
+
+async def claim_jobs(jobs: List[JobPosting], supabase_service: SupabaseService) -> Optional[List[JobPosting]]:
+    """Keep only the jobs this run managed to claim for sharing (None if claiming failed)"""
+    claimed = await supabase_service.claim_jobs_for_share([job.id for job in jobs])
+    if claimed is None:
+        return None
+    return [job for job in jobs if job.id in claimed]
+
+
+def next_checkpoint(check_started: datetime, pending: List[JobPosting]) -> datetime:
+    """
+    Timestamp the next check should start from
+    
+    Jobs this run fetched but did not share (unclaimed, failed or not
+    recorded) hold the checkpoint at the oldest of them, so the next run
+    fetches them again; already-shared jobs are filtered out of that query.
+    """
+    return min((job.createdAt for job in pending if job.createdAt), default=check_started)
+
+
+def _adjust_polling_interval(found_jobs: bool):
+    """Back off polling while idle; return to the base interval once jobs appear"""
+    global _current_interval
+    
+    base = settings.polling_interval_seconds
+    if found_jobs:
+        interval = base
+    else:
+        ceiling = max(settings.max_polling_interval_seconds, base)
+        # Always grow by at least a second; truncation kept tiny bases stuck
+        grown = max(_current_interval + 1, math.ceil(_current_interval * POLLING_BACKOFF_FACTOR))
+        interval = min(grown, ceiling)
+    
+    if interval == _current_interval:
+        return
+    
+    _current_interval = interval
+    if scheduler.running and scheduler.get_job("check_new_jobs"):
+        scheduler.reschedule_job("check_new_jobs", trigger=IntervalTrigger(seconds=interval))
+        logger.info(f"Polling interval set to {interval} seconds")
 
 
 async def check_and_share_new_jobs() -> Dict[str, Any]:
@@ -38,8 +112,10 @@ async def check_and_share_new_jobs() -> Dict[str, Any]:
     """
     logger.info("Starting scheduled job check...")
     
-    supabase_service = SupabaseService()
-    telegram_service = TelegramService()
+    # Shared services keep their Redis and HTTP pools alive across ticks;
+    # they are closed by the application lifespan on shutdown
+    supabase_service = get_supabase_service()
+    telegram_service = get_telegram_service()
     
     if not supabase_service.is_configured():
         logger.error("Supabase service not configured")
@@ -50,49 +126,71 @@ async def check_and_share_new_jobs() -> Dict[str, Any]:
         return {"success": False, "error": "Telegram not configured"}
     
     try:
+        # Checkpoint at the start so jobs created while posting are seen next run
+        check_started = datetime.now(timezone.utc)
+        
         # Get last check timestamp
         last_check = await supabase_service.get_last_check_timestamp()
         
         # If no last check, look back 24 hours
         if last_check is None:
-            last_check = datetime.now(timezone.utc) - timedelta(hours=24)
+            last_check = check_started - timedelta(hours=24)
         
         logger.info(f"Checking for jobs since: {last_check.isoformat()}")
         
-        # Fetch new published jobs
-        new_jobs = await supabase_service.get_new_published_jobs(since=last_check)
+        # Fetch new published jobs (already-shared ones are filtered out)
+        fetched = await supabase_service.get_new_published_jobs(since=last_check)
+        new_jobs = await claim_jobs(fetched, supabase_service) or []
+        
+        # Jobs left unshared by this run; they keep the checkpoint from passing them
+        claimed_ids = {job.id for job in new_jobs}
+        pending = [job for job in fetched if job.id not in claimed_ids]
         
         if not new_jobs:
             logger.info("No new jobs to share")
-            await supabase_service.set_last_check_timestamp()
-            await supabase_service.close()
+            _adjust_polling_interval(found_jobs=False)
+            await supabase_service.set_last_check_timestamp(next_checkpoint(check_started, pending))
             return {"success": True, "jobs_processed": 0, "message": "No new jobs"}
         
         logger.info(f"Found {len(new_jobs)} new jobs to share")
+        _adjust_polling_interval(found_jobs=True)
+        
+        # Share jobs concurrently, bounded to stay within Telegram rate limits
+        semaphore = asyncio.Semaphore(settings.telegram_max_concurrent_posts)
         
-        # Process each job
-        results = []
-        for job in new_jobs:
-            try:
-                result = await share_job_to_telegram(job, telegram_service, supabase_service)
-                results.append({
-                    "job_id": job.id,
-                    "title": job.title,
-                    **result
-                })
-            except Exception as e:
-                logger.error(f"Error sharing job {job.id}: {e}")
-                results.append({
-                    "job_id": job.id,
-                    "title": job.title,
-                    "success": False,
-                    "error": str(e)
-                })
+        async def share_one(job: JobPosting) -> Dict[str, Any]:
+            async with semaphore:
+                return await share_job_to_telegram(job, telegram_service, supabase_service)
+        
+        outcomes = await asyncio.gather(
+            *(share_one(job) for job in new_jobs),
+            return_exceptions=True
+        )
+        
+        # Build fixed-shape results and count successes in a single pass
+        results = [None] * len(new_jobs)
+        successful = 0
+        for i, (job, outcome) in enumerate(zip(new_jobs, outcomes)):
+            if isinstance(outcome, BaseException):
+                # CancelledError and friends have no message; keep the type visible
+                error = str(outcome) or type(outcome).__name__
+                logger.error(f"Error sharing job {job.id}: {error}")
+                outcome = {"success": False, "error": error}
+            ok = outcome.get("success", False)
+            results[i] = {
+                "job_id": job.id,
+                "title": job.title,
+                "success": ok,
+                "telegram": outcome.get("telegram"),
+                "error": outcome.get("error")
+            }
+            successful += ok
+            if not ok:
+                pending.append(job)
         
         # Update last check timestamp
-        await supabase_service.set_last_check_timestamp()
+        await supabase_service.set_last_check_timestamp(next_checkpoint(check_started, pending))
         
-        successful = sum(1 for r in results if r.get("success", False))
         logger.info(f"Job check completed. Shared {successful}/{len(new_jobs)} jobs.")
         
         return {
@@ -105,8 +203,6 @@ async def check_and_share_new_jobs() -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error in check_and_share_new_jobs: {e}")
         return {"success": False, "error": str(e)}
-    finally:
-        await supabase_service.close()
 
 
 async def share_job_to_telegram(
@@ -139,21 +235,30 @@ async def share_job_to_telegram(
 
 def start_scheduler():
     """Start the background scheduler"""
+    global _current_interval
+    
     if scheduler.running:
         logger.info("Scheduler already running")
         return
     
-    # Add the job check task
-    scheduler.add_job(
-        check_and_share_new_jobs,
-        trigger=IntervalTrigger(seconds=settings.polling_interval_seconds),
-        id="check_new_jobs",
-        name="Check for new jobs and share to Telegram",
-        replace_existing=True,
-        max_instances=1  # Prevent overlapping runs
-    )
+    _current_interval = settings.polling_interval_seconds
+    trigger = IntervalTrigger(seconds=settings.polling_interval_seconds)
     
     scheduler.start()
+    
+    # A persisted job keeps its next run time, so a tick missed during a
+    # restart fires once; only a backed-off or changed interval is reset
+    job = scheduler.get_job("check_new_jobs")
+    if job is None:
+        scheduler.add_job(
+            check_and_share_new_jobs,
+            trigger=trigger,
+            id="check_new_jobs",
+            name="Check for new jobs and share to Telegram"
+        )
+    elif job.trigger.interval != trigger.interval:
+        job.reschedule(trigger=trigger)
+    
     logger.info(f"Scheduler started. Checking for new jobs every {settings.polling_interval_seconds} seconds.")
 
 
@@ -176,5 +281,6 @@ def get_scheduler_status() -> Dict[str, Any]:
     
     return {
         "running": scheduler.running,
+        "polling_interval_seconds": _current_interval,
         "jobs": jobs
     }
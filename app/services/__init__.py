@@ -6,10 +6,27 @@ Contains all service modules for:
 - Telegram channel posting
 """
 
+from functools import lru_cache
+
 from app.services.supabase_service import SupabaseService
 from app.services.telegram_service import TelegramService
 
+
+@lru_cache()
+def get_supabase_service() -> SupabaseService:
+    """Get cached Supabase service instance"""
+    return SupabaseService()
+
+
+@lru_cache()
+def get_telegram_service() -> TelegramService:
+    """Get cached Telegram service instance"""
+    return TelegramService()
+
+
 __all__ = [
     "SupabaseService",
-    "TelegramService"
+    "TelegramService",
+    "get_supabase_service",
+    "get_telegram_service"
 ]
@@ -5,21 +5,87 @@ This service connects to the FlexiTask Supabase database to:
 1. Monitor new job postings
 2. Track which jobs have been shared to social media
 3. Fetch job details with related data (category, country, city)
+
+The polling query filters on "isPublished" and "createdAt" and sorts by
+"createdAt" DESC. It assumes this index exists (see DEPLOYMENT.md):
+
+    CREATE INDEX CONCURRENTLY idx_jobposts_pub_created
+        ON job_posts ("createdAt" DESC)
+        WHERE "isPublished";
 """
 
 import asyncio
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from supabase import create_client, Client
+from cachetools import TTLCache
 import redis.asyncio as redis
 import json
 import logging
+import time
 
 from app.config import get_settings
-from app.models import JobPosting, JobCategory, Country, City, SharedJob
+from app.models import JobPosting
 
 logger = logging.getLogger(__name__)
 
+# Columns read for a job post (only what JobPosting uses) plus its relations
+JOB_POST_SELECT = (
+    "id,title,slug,companyName,employmentType,workLocationType,isInternship,"
+    "categoryId,countryId,cityId,uniqueDescription,linkedInApplyURL,isPublished,"
+    "jobImageUrl,experienceYears,createdAt,updatedAt,"
+    "job_categories:categoryId(id,name,slug),"
+    "countries:countryId(id,name,code),"
+    "cities:cityId(id,name,countryId)"
+)
+
+# How long get_stats() results are reused, in seconds
+STATS_CACHE_TTL_SECONDS = 5
+
+# Redis connection pool limits; callers wait up to REDIS_POOL_TIMEOUT
+# seconds for a free connection
+REDIS_MAX_CONNECTIONS = 32
+REDIS_POOL_TIMEOUT = 10
+REDIS_HEALTH_CHECK_INTERVAL = 30
+
+# How long a shared job is remembered to prevent re-sharing
+SHARED_JOB_TTL_SECONDS = 60 * 60 * 24 * 30  # 30 days
+
+# How long a job stays claimed by the run that is posting it: a base
+# window plus time per job in the batch, since the rate limiter lets the
+# channel take about 18 posts a minute (one every ~3.3s)
+SHARE_CLAIM_TTL_SECONDS = 300
+SHARE_CLAIM_SECONDS_PER_JOB = 4
+
+# In-process cache of job IDs known to be shared
+SHARED_CACHE_MAX_SIZE = 10_000
+SHARED_CACHE_TTL_SECONDS = 300
+
+
+def _parse_job_rows(rows: List[Dict[str, Any]]) -> List[JobPosting]:
+    """Parse job_posts rows into JobPostings, skipping bad rows"""
+    jobs = []
+    for job_data in rows:
+        try:
+            jobs.append(JobPosting.from_supabase_row(job_data))
+            
+        except Exception as e:
+            logger.error(f"Error parsing job {job_data.get('id')}: {e}")
+            continue
+    return jobs
+
+
+def _decode_shared_job(data: Dict[str, str]) -> Dict[str, Any]:
+    """Convert a shared_job:{id} Redis hash back to typed values"""
+    message_id = data.get("telegram_message_id")
+    return {
+        "job_id": data.get("job_id"),
+        "shared_at": data.get("shared_at"),
+        "telegram_shared": data.get("telegram_shared") == "1",
+        "telegram_message_id": int(message_id) if message_id else None,
+        "error_message": data.get("error_message") or None
+    }
+
 
 class SupabaseService:
     """
@@ -33,6 +99,14 @@ class SupabaseService:
         self.settings = get_settings()
         self.supabase: Optional[Client] = None
         self.redis: Optional[redis.Redis] = None
+        self._pool: Optional[redis.BlockingConnectionPool] = None
+        self._stats_cache: Optional[Tuple[Dict[str, Any], float]] = None
+        self._last_check: Optional[datetime] = None
+        # Job IDs known to be shared; saves Redis lookups on repeat ticks
+        self._shared_cache: TTLCache = TTLCache(
+            maxsize=SHARED_CACHE_MAX_SIZE,
+            ttl=SHARED_CACHE_TTL_SECONDS
+        )
         self._initialize_clients()
     
     def _initialize_clients(self):
@@ -51,11 +125,21 @@ class SupabaseService:
     async def _get_redis(self) -> redis.Redis:
         """Get Redis connection (lazy initialization)"""
         if self.redis is None:
-            self.redis = redis.from_url(
+            # Bounded pool: bursts of concurrent posts queue for a connection
+            # instead of failing with "Too many connections". Health checks
+            # ping connections idle for a while and transparently reconnect
+            # ones the server or a proxy dropped.
+            self._pool = redis.BlockingConnectionPool.from_url(
                 self.settings.redis_url,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+                socket_keepalive=True,
+                retry_on_timeout=True,
                 encoding="utf-8",
                 decode_responses=True
             )
+            self.redis = redis.Redis(connection_pool=self._pool)
         return self.redis
     
     def is_configured(self) -> bool:
@@ -78,73 +162,37 @@ class SupabaseService:
         
         try:
             # Build query for published jobs
-            query = self.supabase.table("job_posts").select(
-                "*,"
-                "job_categories:categoryId(id, name, slug),"
-                "countries:countryId(id, name, code),"
-                "cities:cityId(id, name, countryId)"
-            ).eq("isPublished", True)
+            query = self.supabase.table("job_posts").select(JOB_POST_SELECT).eq("isPublished", True)
             
             # Filter by creation date if specified
             if since:
                 query = query.gte("createdAt", since.isoformat())
             
+            # Let the database skip jobs already stamped as shared
+            if self.settings.supabase_shared_at_column:
+                query = query.is_(self.settings.supabase_shared_at_column, "null")
+            
             # Order by creation date, newest first
             query = query.order("createdAt", desc=True)
             
-            response = query.execute()
+            # The Supabase client is synchronous; keep its HTTP round-trip off the event loop
+            response = await asyncio.to_thread(query.execute)
             
             if not response.data:
                 return []
             
-            jobs = []
-            for job_data in response.data:
-                try:
-                    # Check if job has already been shared
-                    if await self._is_job_shared(job_data["id"]):
-                        continue
-                    
-                    # Parse related data
-                    category = None
-                    if job_data.get("job_categories"):
-                        category = JobCategory(**job_data["job_categories"])
-                    
-                    country = None
-                    if job_data.get("countries"):
-                        country = Country(**job_data["countries"])
-                    
-                    city = None
-                    if job_data.get("cities"):
-                        city = City(**job_data["cities"])
-                    
-                    # Create JobPosting object
-                    job = JobPosting(
-                        id=job_data["id"],
-                        title=job_data["title"],
-                        slug=job_data["slug"],
-                        companyName=job_data["companyName"],
-                        employmentType=job_data["employmentType"],
-                        workLocationType=job_data["workLocationType"],
-                        isInternship=job_data.get("isInternship", False),
-                        categoryId=job_data.get("categoryId"),
-                        countryId=job_data.get("countryId"),
-                        cityId=job_data.get("cityId"),
-                        uniqueDescription=job_data.get("uniqueDescription"),
-                        linkedInApplyURL=job_data["linkedInApplyURL"],
-                        isPublished=job_data["isPublished"],
-                        jobImageUrl=job_data.get("jobImageUrl"),
-                        experienceYears=job_data.get("experienceYears"),
-                        createdAt=datetime.fromisoformat(job_data["createdAt"].replace("Z", "+00:00")) if job_data.get("createdAt") else None,
-                        updatedAt=datetime.fromisoformat(job_data["updatedAt"].replace("Z", "+00:00")) if job_data.get("updatedAt") else None,
-                        category=category,
-                        country=country,
-                        city=city
-                    )
-                    jobs.append(job)
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing job {job_data.get('id')}: {e}")
-                    continue
+            # Look up which jobs were already shared in one Redis round-trip
+            shared_ids = await self._get_shared_job_ids(
+                [job_data["id"] for job_data in response.data]
+            )
+            
+            # Only unshared rows are worth validating
+            rows = [job_data for job_data in response.data if job_data["id"] not in shared_ids]
+            if not rows:
+                return []
+            
+            # Parse off the event loop so large windows don't stall other tasks
+            jobs = await asyncio.to_thread(_parse_job_rows, rows)
             
             logger.info(f"Found {len(jobs)} new jobs to share")
             return jobs
@@ -159,66 +207,98 @@ class SupabaseService:
             return None
         
         try:
-            response = self.supabase.table("job_posts").select(
-                "*,"
-                "job_categories:categoryId(id, name, slug),"
-                "countries:countryId(id, name, code),"
-                "cities:cityId(id, name, countryId)"
-            ).eq("id", job_id).single().execute()
+            response = self.supabase.table("job_posts").select(JOB_POST_SELECT).eq("id", job_id).single().execute()
             
             if not response.data:
                 return None
             
-            job_data = response.data
-            
-            # Parse related data
-            category = None
-            if job_data.get("job_categories"):
-                category = JobCategory(**job_data["job_categories"])
-            
-            country = None
-            if job_data.get("countries"):
-                country = Country(**job_data["countries"])
-            
-            city = None
-            if job_data.get("cities"):
-                city = City(**job_data["cities"])
-            
-            return JobPosting(
-                id=job_data["id"],
-                title=job_data["title"],
-                slug=job_data["slug"],
-                companyName=job_data["companyName"],
-                employmentType=job_data["employmentType"],
-                workLocationType=job_data["workLocationType"],
-                isInternship=job_data.get("isInternship", False),
-                categoryId=job_data.get("categoryId"),
-                countryId=job_data.get("countryId"),
-                cityId=job_data.get("cityId"),
-                uniqueDescription=job_data.get("uniqueDescription"),
-                linkedInApplyURL=job_data["linkedInApplyURL"],
-                isPublished=job_data["isPublished"],
-                jobImageUrl=job_data.get("jobImageUrl"),
-                experienceYears=job_data.get("experienceYears"),
-                createdAt=datetime.fromisoformat(job_data["createdAt"].replace("Z", "+00:00")) if job_data.get("createdAt") else None,
-                updatedAt=datetime.fromisoformat(job_data["updatedAt"].replace("Z", "+00:00")) if job_data.get("updatedAt") else None,
-                category=category,
-                country=country,
-                city=city
-            )
+            return JobPosting.from_supabase_row(response.data)
             
         except Exception as e:
             logger.error(f"Error fetching job {job_id}: {e}")
             return None
     
-    async def _is_job_shared(self, job_id: str) -> bool:
-        """Check if a job has already been shared (using Redis)"""
+    async def _get_shared_job_ids(self, job_ids: List[str]) -> set:
+        """Return the subset of job IDs already shared (one Redis pipeline)"""
+        shared = {job_id for job_id in job_ids if job_id in self._shared_cache}
+        unknown = [job_id for job_id in job_ids if job_id not in shared]
+        if not unknown:
+            return shared
+        
+        try:
+            redis_client = await self._get_redis()
+            pipe = redis_client.pipeline(transaction=False)
+            for job_id in unknown:
+                pipe.exists(f"shared_job:{job_id}")
+            exists = await pipe.execute()
+            for job_id, found in zip(unknown, exists):
+                if found:
+                    self._shared_cache[job_id] = True
+                    shared.add(job_id)
+            return shared
+        except Exception as e:
+            logger.error(f"Redis error checking shared jobs: {e}")
+            return shared
+    
+    def _queue_shared_job(
+        self,
+        pipe,
+        job_id: str,
+        shared_at: datetime,
+        telegram_shared: bool,
+        telegram_message_id: Optional[int],
+        error_message: Optional[str]
+    ):
+        """Queue the Redis writes that record one shared job on a pipeline"""
+        key = f"shared_job:{job_id}"
+        
+        # Drop any legacy JSON-string entry first; HSET on it fails with WRONGTYPE
+        pipe.delete(key)
+        
+        # Hash values are strings; empty string stands for None
+        pipe.hset(key, mapping={
+            "job_id": job_id,
+            "shared_at": shared_at.isoformat(),
+            "telegram_shared": "1" if telegram_shared else "0",
+            "telegram_message_id": "" if telegram_message_id is None else str(telegram_message_id),
+            "error_message": error_message or ""
+        })
+        pipe.expire(key, SHARED_JOB_TTL_SECONDS)
+        
+        # Also maintain a sorted set for tracking order
+        pipe.zadd("shared_jobs_timeline", {job_id: shared_at.timestamp()})
+    
+    async def claim_jobs_for_share(self, job_ids: List[str]) -> Optional[set]:
+        """
+        Atomically claim jobs before posting them (one Redis pipeline)
+        
+        Overlapping runs (cron ticks, manual triggers, GitHub Actions) race
+        on SET NX, so only one of them posts each job. Claims expire on
+        their own, so a job whose post failed can be claimed again by a
+        later run.
+        
+        Returns:
+            The subset of job IDs this caller owns, or None if Redis is
+            unavailable. Without a claim another run could post the same
+            job, so callers skip the jobs and keep them for a later run.
+        """
+        if not job_ids:
+            return set()
+        
+        # Every claim must outlive the whole batch, or a queued job could
+        # be re-claimed by an overlapping run before it is posted
+        ttl = SHARE_CLAIM_TTL_SECONDS + len(job_ids) * SHARE_CLAIM_SECONDS_PER_JOB
+        
         try:
             redis_client = await self._get_redis()
-            return await redis_client.exists(f"shared_job:{job_id}") > 0
+            pipe = redis_client.pipeline(transaction=False)
+            for job_id in job_ids:
+                pipe.set(f"share_claim:{job_id}", "1", nx=True, ex=ttl)
+            claimed = await pipe.execute()
+            return {job_id for job_id, ok in zip(job_ids, claimed) if ok}
         except Exception as e:
-            logger.error(f"Redis error checking shared job: {e}")
-            return False
+            logger.error(f"Redis error claiming jobs, skipping them this run: {e}")
+            return None
     
     async def mark_job_as_shared(
         self,
@@ -230,32 +310,25 @@ class SupabaseService:
         """
         Mark a job as shared in Redis
         
-        Stores sharing metadata with a TTL of 30 days to prevent
+        Stores sharing metadata as a hash with a TTL of 30 days to prevent
         re-sharing the same job.
         """
         try:
             redis_client = await self._get_redis()
             
-            shared_data = {
-                "job_id": job_id,
-                "shared_at": datetime.now(timezone.utc).isoformat(),
-                "telegram_shared": telegram_shared,
-                "telegram_message_id": telegram_message_id,
-                "error_message": error_message
-            }
-            
-            # Store in Redis with 30-day TTL
-            await redis_client.setex(
-                f"shared_job:{job_id}",
-                60 * 60 * 24 * 30,  # 30 days
-                json.dumps(shared_data)
+            pipe = redis_client.pipeline(transaction=False)
+            self._queue_shared_job(
+                pipe,
+                job_id,
+                datetime.now(timezone.utc),
+                telegram_shared,
+                telegram_message_id,
+                error_message
             )
+            await pipe.execute()
+            self._shared_cache[job_id] = True
             
-            # Also maintain a sorted set for tracking order
-            await redis_client.zadd(
-                "shared_jobs_timeline",
-                {job_id: datetime.now(timezone.utc).timestamp()}
-            )
+            await self._stamp_shared_at([job_id])
             
             logger.info(f"Marked job {job_id} as shared")
             return True
@@ -264,14 +337,76 @@ class SupabaseService:
             logger.error(f"Error marking job as shared: {e}")
             return False
     
+    async def mark_jobs_as_shared_bulk(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Mark several jobs as shared in a single Redis round-trip
+        
+        Args:
+            rows: Dicts with job_id and optional telegram_shared,
+                telegram_message_id and error_message keys
+        """
+        if not rows:
+            return True
+        
+        try:
+            redis_client = await self._get_redis()
+            now = datetime.now(timezone.utc)
+            
+            pipe = redis_client.pipeline(transaction=False)
+            for row in rows:
+                self._queue_shared_job(
+                    pipe,
+                    row["job_id"],
+                    now,
+                    row.get("telegram_shared", False),
+                    row.get("telegram_message_id"),
+                    row.get("error_message")
+                )
+            await pipe.execute()
+            for row in rows:
+                self._shared_cache[row["job_id"]] = True
+            
+            await self._stamp_shared_at([row["job_id"] for row in rows])
+            
+            logger.info(f"Marked {len(rows)} jobs as shared")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error marking jobs as shared: {e}")
+            return False
+    
+    async def _stamp_shared_at(self, job_ids: List[str]):
+        """
+        Stamp the configured shared-at column on job_posts
+        
+        No-op unless SUPABASE_SHARED_AT_COLUMN is set. Failures are logged
+        only; Redis remains the source of truth for de-duplication.
+        """
+        column = self.settings.supabase_shared_at_column
+        if not column or not job_ids or not self.is_configured():
+            return
+        
+        try:
+            # The Supabase client is synchronous; keep its HTTP round-trip off the event loop
+            query = self.supabase.table("job_posts").update({
+                column: datetime.now(timezone.utc).isoformat()
+            }).in_("id", job_ids)
+            await asyncio.to_thread(query.execute)
+        except Exception as e:
+            logger.error(f"Error stamping {column} on shared jobs: {e}")
+    
     async def get_shared_job_info(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get sharing information for a specific job"""
         try:
             redis_client = await self._get_redis()
-            data = await redis_client.get(f"shared_job:{job_id}")
-            if data:
-                return json.loads(data)
-            return None
+            key = f"shared_job:{job_id}"
+            try:
+                data = await redis_client.hgetall(key)
+            except redis.ResponseError:
+                # Legacy entry stored as a JSON string (WRONGTYPE for HGETALL)
+                legacy = await redis_client.get(key)
+                return json.loads(legacy) if legacy else None
+            return _decode_shared_job(data) if data else None
         except Exception as e:
             logger.error(f"Error getting shared job info: {e}")
             return None
@@ -283,13 +418,36 @@ class SupabaseService:
             
             # Get most recent job IDs from sorted set
             job_ids = await redis_client.zrevrange("shared_jobs_timeline", 0, limit - 1)
+            if not job_ids:
+                return []
             
-            jobs = []
+            # Fetch all hashes in one round-trip
+            pipe = redis_client.pipeline(transaction=False)
             for job_id in job_ids:
-                info = await self.get_shared_job_info(job_id)
-                if info:
-                    jobs.append(info)
+                pipe.hgetall(f"shared_job:{job_id}")
+            payloads = await pipe.execute(raise_on_error=False)
+            
+            # Entries written before the hash format are JSON strings and fail
+            # with WRONGTYPE; read those with GET in a second round-trip
+            legacy_ids = [
+                job_id for job_id, data in zip(job_ids, payloads)
+                if isinstance(data, redis.ResponseError)
+            ]
+            legacy = {}
+            if legacy_ids:
+                pipe = redis_client.pipeline(transaction=False)
+                for job_id in legacy_ids:
+                    pipe.get(f"shared_job:{job_id}")
+                legacy = dict(zip(legacy_ids, await pipe.execute(raise_on_error=False)))
             
+            jobs = []
+            for job_id, data in zip(job_ids, payloads):
+                if job_id in legacy:
+                    raw = legacy[job_id]
+                    if isinstance(raw, str):
+                        jobs.append(json.loads(raw))
+                elif data and not isinstance(data, Exception):
+                    jobs.append(_decode_shared_job(data))
             return jobs
             
         except Exception as e:
@@ -297,13 +455,21 @@ class SupabaseService:
             return []
     
     async def get_last_check_timestamp(self) -> Optional[datetime]:
-        """Get the timestamp of the last job check"""
+        """
+        Get the timestamp of the last job check
+        
+        Read from Redis once, then served from memory; the scheduler runs a
+        single instance, so this process is the only writer.
+        """
+        if self._last_check is not None:
+            return self._last_check
+        
         try:
             redis_client = await self._get_redis()
             timestamp = await redis_client.get("last_job_check_timestamp")
             if timestamp:
-                return datetime.fromisoformat(timestamp)
-            return None
+                self._last_check = datetime.fromisoformat(timestamp)
+            return self._last_check
         except Exception as e:
             logger.error(f"Error getting last check timestamp: {e}")
             return None
@@ -315,13 +481,22 @@ class SupabaseService:
             if timestamp is None:
                 timestamp = datetime.now(timezone.utc)
             await redis_client.set("last_job_check_timestamp", timestamp.isoformat())
+            self._last_check = timestamp
             return True
         except Exception as e:
             logger.error(f"Error setting last check timestamp: {e}")
             return False
     
     async def get_stats(self) -> Dict[str, Any]:
-        """Get sharing statistics"""
+        """
+        Get sharing statistics
+        
+        Results are reused for STATS_CACHE_TTL_SECONDS so frequent health
+        checks don't hit Redis on every request.
+        """
+        if self._stats_cache and time.monotonic() < self._stats_cache[1]:
+            return self._stats_cache[0]
+        
         try:
             redis_client = await self._get_redis()
             
@@ -331,11 +506,13 @@ class SupabaseService:
             # Get last check timestamp
             last_check = await self.get_last_check_timestamp()
             
-            return {
+            stats = {
                 "total_jobs_shared": total_shared,
                 "last_check": last_check.isoformat() if last_check else None,
                 "supabase_connected": self.is_configured()
             }
+            self._stats_cache = (stats, time.monotonic() + STATS_CACHE_TTL_SECONDS)
+            return stats
             
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
@@ -364,34 +541,29 @@ class SupabaseService:
             # Calculate cutoff date
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
             
-            # First, get the count of jobs to be deleted
-            count_response = self.supabase.table("job_posts").select(
-                "id", count="exact"
-            ).lt("createdAt", cutoff_date.isoformat()).execute()
-            
-            jobs_to_delete = count_response.count if count_response.count else 0
-            
-            if jobs_to_delete == 0:
-                logger.info(f"No jobs older than {days} days found")
-                return {"success": True, "deleted_count": 0, "message": "No old jobs to delete"}
-            
-            # Delete jobs older than cutoff date
+            # Delete jobs older than cutoff date; the returned rows give the count
             delete_response = self.supabase.table("job_posts").delete().lt(
                 "createdAt", cutoff_date.isoformat()
             ).execute()
             
-            deleted_count = len(delete_response.data) if delete_response.data else jobs_to_delete
+            deleted_count = len(delete_response.data or [])
+            
+            if deleted_count == 0:
+                logger.info(f"No jobs older than {days} days found")
+                return {"success": True, "deleted_count": 0, "message": "No old jobs to delete"}
             
             logger.info(f"Deleted {deleted_count} jobs older than {days} days")
             
-            # Also clean up Redis entries for deleted jobs
-            if delete_response.data:
+            # Also clean up Redis entries for deleted jobs in one round-trip
+            deleted_ids = [job["id"] for job in delete_response.data or [] if job.get("id")]
+            if deleted_ids:
+                for job_id in deleted_ids:
+                    self._shared_cache.pop(job_id, None)
                 redis_client = await self._get_redis()
-                for job in delete_response.data:
-                    job_id = job.get("id")
-                    if job_id:
-                        await redis_client.delete(f"shared_job:{job_id}")
-                        await redis_client.zrem("shared_jobs_timeline", job_id)
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.unlink(*(f"shared_job:{job_id}" for job_id in deleted_ids))
+                pipe.zrem("shared_jobs_timeline", *deleted_ids)
+                await pipe.execute()
             
             return {
                 "success": True,
@@ -418,4 +590,5 @@ class SupabaseService:
         """Close connections"""
         if self.redis:
             await self.redis.close()
+            await self._pool.disconnect()
             logger.info("Redis connection closed")
@@ -5,15 +5,182 @@ Uses python-telegram-bot library to send job alerts to Telegram channels.
 Supports both text messages and messages with images.
 """
 
-from telegram import Bot
 from telegram.constants import ParseMode
+from telegram.ext import AIORateLimiter, ExtBot
+from telegram.request import HTTPXRequest
 from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
 from app.config import get_settings
 from app.models import JobPosting
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Readable labels for the FlexiTask enum values (read-only views)
+EMPLOYMENT_MAP = MappingProxyType({
+    "FULL_TIME": "Full Time",
+    "PART_TIME": "Part Time",
+    "CONTRACT": "Contract"
+})
+
+WORK_LOCATION_MAP = MappingProxyType({
+    "ONSITE": "On-site",
+    "REMOTE": "Remote",
+    "HYBRID": "Hybrid"
+})
+
+EXPERIENCE_MAP = MappingProxyType({
+    "ONE_PLUS": "1+ years",
+    "TWO_PLUS": "2+ years",
+    "FIVE_PLUS": "5+ years"
+})
+
+# Image URLs Telegram can fetch as-is
+_URL_SCHEMES = ("http://", "https://")
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+
+# Pre-escaped hashtags added to every job
+_BASE_HASHTAGS = ("\\#Jobs", "\\#Hiring", "\\#FlexiTask")
+
+# Pre-escaped fixed line for internship jobs
+_INTERNSHIP_LINE = "🎓 *Internship Position*\n"
+
+# Telegram MarkdownV2 job message; optional *_line/_block fields are
+# either a complete line or an empty string
+MESSAGE_TEMPLATE = (
+    "🚀 *New Job Alert\\!*\n\n"
+    "📌 *{title}* at _{company}_\n"
+    "📍 {location} \\| {work_type}\n"
+    "💼 {employment}\n"
+    "{category_line}"
+    "{experience_line}"
+    "{internship_line}"
+    "{description_block}"
+    "\n👉 [Apply Now]({job_url})"
+    "\n\n{hashtags}"
+)
+
+
+# Characters that must be backslash-escaped in Telegram MarkdownV2
+_MD2_ESCAPE = re.compile(r'([_*\[\]()~`>#+\-=|{}.!])')
+
+
+def _escape_markdown(text: str) -> str:
+    """Escape special characters for Telegram MarkdownV2"""
+    return _MD2_ESCAPE.sub(r'\\\1', text)
+
+
+# Enum and category values repeat across jobs, so escape each one once
+@lru_cache(maxsize=None)
+def _render_employment(value: str) -> str:
+    """Escaped employment type label"""
+    return _escape_markdown(EMPLOYMENT_MAP.get(value, value))
+
+
+@lru_cache(maxsize=None)
+def _render_work_location(value: str) -> str:
+    """Escaped work location label"""
+    return _escape_markdown(WORK_LOCATION_MAP.get(value, value))
+
+
+@lru_cache(maxsize=None)
+def _render_experience(value: str) -> str:
+    """Escaped experience label"""
+    return _escape_markdown(EXPERIENCE_MAP.get(value, value))
+
+
+@lru_cache(maxsize=256)
+def _render_category(name: str) -> str:
+    """Escaped category name"""
+    return _escape_markdown(name)
+
+
+@lru_cache(maxsize=256)
+def _render_category_hashtag(name: str) -> str:
+    """Category hashtag, e.g. \\#DesignAndCreative"""
+    return "\\#" + name.replace(" ", "").replace("&", "And")
+
+
+@lru_cache(maxsize=512)
+def _format_job_message_cached(
+    title: str,
+    company_name: str,
+    city: Optional[str],
+    country: Optional[str],
+    employment_type: str,
+    work_location_type: str,
+    category: Optional[str],
+    experience_years: Optional[str],
+    is_internship: bool,
+    description: Optional[str],
+    slug: str,
+    job_site_url: str
+) -> str:
+    """
+    Build the MarkdownV2 message for a job
+    
+    Keyed on the plain job fields so previews, retries and re-runs of the
+    same job return the cached message without formatting it again.
+    """
+    
+    # Build location string
+    location_parts = []
+    if city:
+        location_parts.append(city)
+    if country:
+        location_parts.append(country)
+    location = ", ".join(location_parts) if location_parts else "Location not specified"
+    
+    # Get readable types
+    employment = _render_employment(employment_type)
+    work_type = _render_work_location(work_location_type)
+    
+    # Escape special characters for MarkdownV2
+    title = _escape_markdown(title)
+    company = _escape_markdown(company_name)
+    location = _escape_markdown(location)
+    
+    # Optional lines are empty strings when the field is missing
+    category_line = ""
+    if category:
+        category_line = f"🏷️ {_render_category(category)}\n"
+    
+    experience_line = ""
+    if experience_years:
+        experience_line = f"📊 Experience: {_render_experience(experience_years)}\n"
+    
+    internship_line = _INTERNSHIP_LINE if is_internship else ""
+    
+    # Add description preview
+    description_block = ""
+    if description:
+        if len(description) > 200:
+            description = description[:200] + "…"
+        description_block = f"\n{_escape_markdown(description)}\n"
+    
+    # Add hashtags
+    hashtags = list(_BASE_HASHTAGS)
+    if category:
+        hashtags.insert(1, _render_category_hashtag(category))
+    if work_location_type == "REMOTE":
+        hashtags.append("\\#RemoteJobs")
+    
+    return MESSAGE_TEMPLATE.format_map({
+        "title": title,
+        "company": company,
+        "location": location,
+        "work_type": work_type,
+        "employment": employment,
+        "category_line": category_line,
+        "experience_line": experience_line,
+        "internship_line": internship_line,
+        "description_block": description_block,
+        "job_url": f"{job_site_url}/jobs/{slug}",
+        "hashtags": " ".join(hashtags)
+    })
+
 
 class TelegramService:
     """
@@ -35,14 +202,31 @@ class TelegramService:
         self.settings = get_settings()
         self.bot_token = self.settings.telegram_bot_token
         self.channel_id = self.settings.telegram_channel_id
+        self._configured = bool(self.bot_token and self.channel_id)
         self.bot = None
+        self._request: Optional[HTTPXRequest] = None
         
         if self.is_configured():
-            self.bot = Bot(token=self.bot_token)
+            # Long-lived connection pool sized for concurrent posting
+            self._request = HTTPXRequest(
+                connection_pool_size=self.settings.telegram_max_concurrent_posts
+            )
+            # Pace sends under Telegram's flood limits and retry on RetryAfter
+            self.bot = ExtBot(
+                token=self.bot_token,
+                request=self._request,
+                rate_limiter=AIORateLimiter(
+                    overall_max_rate=25,
+                    overall_time_period=1,
+                    group_max_rate=18,
+                    group_time_period=60,
+                    max_retries=3
+                )
+            )
     
     def is_configured(self) -> bool:
         """Check if Telegram service is configured"""
-        return bool(self.bot_token and self.channel_id)
+        return self._configured
     
     def format_job_message(self, job: JobPosting) -> str:
         """
@@ -51,94 +235,20 @@ class TelegramService:
         Telegram supports Markdown and HTML formatting.
         Using Markdown for compatibility.
         """
-        
-        # Map employment types to readable format
-        employment_map = {
-            "FULL_TIME": "Full Time",
-            "PART_TIME": "Part Time",
-            "CONTRACT": "Contract"
-        }
-        
-        work_location_map = {
-            "ONSITE": "On-site",
-            "REMOTE": "Remote",
-            "HYBRID": "Hybrid"
-        }
-        
-        experience_map = {
-            "ONE_PLUS": "1+ years",
-            "TWO_PLUS": "2+ years",
-            "FIVE_PLUS": "5+ years"
-        }
-        
-        # Build location string
-        location_parts = []
-        if job.city:
-            location_parts.append(job.city.name)
-        if job.country:
-            location_parts.append(job.country.name)
-        location = ", ".join(location_parts) if location_parts else "Location not specified"
-        
-        # Get readable types
-        employment = self._escape_markdown(employment_map.get(job.employmentType.value, job.employmentType.value))
-        work_type = self._escape_markdown(work_location_map.get(job.workLocationType.value, job.workLocationType.value))
-        
-        # Build message with Telegram Markdown formatting
-        message = f"🚀 *New Job Alert\\!*\n\n"
-        
-        # Escape special characters for MarkdownV2
-        title = self._escape_markdown(job.title)
-        company = self._escape_markdown(job.companyName)
-        location = self._escape_markdown(location)
-        
-        message += f"📌 *{title}* at _{company}_\n"
-        message += f"📍 {location} \\| {work_type}\n"
-        message += f"💼 {employment}\n"
-        
-        # Add category if available
-        if job.category:
-            category_name = self._escape_markdown(job.category.name)
-            message += f"🏷️ {category_name}\n"
-        
-        # Add experience requirement
-        if job.experienceYears:
-            experience = self._escape_markdown(experience_map.get(job.experienceYears.value, job.experienceYears.value))
-            message += f"📊 Experience: {experience}\n"
-        
-        # Add internship badge if applicable
-        if job.isInternship:
-            message += "🎓 *Internship Position*\n"
-        
-        # Add description preview
-        if job.uniqueDescription:
-            description = job.uniqueDescription[:200]
-            if len(job.uniqueDescription) > 200:
-                description += "..."
-            description = self._escape_markdown(description)
-            message += f"\n{description}\n"
-        
-        # Add apply link
-        job_url = f"{self.settings.job_site_url}/jobs/{job.slug}"
-        message += f"\n👉 [Apply Now]({job_url})"
-        
-        # Add hashtags
-        hashtags = ["\\#Jobs", "\\#Hiring", "\\#FlexiTask"]
-        if job.category:
-            category_tag = "\\#" + job.category.name.replace(" ", "").replace("&", "And")
-            hashtags.insert(1, category_tag)
-        if job.workLocationType.value == "REMOTE":
-            hashtags.append("\\#RemoteJobs")
-        
-        message += "\n\n" + " ".join(hashtags)
-        
-        return message
-    
-    def _escape_markdown(self, text: str) -> str:
-        """Escape special characters for Telegram MarkdownV2"""
-        special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-        for char in special_chars:
-            text = text.replace(char, f'\\{char}')
-        return text
+        return _format_job_message_cached(
+            title=job.title,
+            company_name=job.companyName,
+            city=job.city.name if job.city else None,
+            country=job.country.name if job.country else None,
+            employment_type=job.employmentType.value,
+            work_location_type=job.workLocationType.value,
+            category=job.category.name if job.category else None,
+            experience_years=job.experienceYears.value if job.experienceYears else None,
+            is_internship=job.isInternship,
+            description=job.uniqueDescription,
+            slug=job.slug,
+            job_site_url=self.settings.job_site_url
+        )
     
     async def send_to_channel(self, message: str, parse_mode: str = "MarkdownV2") -> dict:
         """
@@ -157,7 +267,7 @@ class TelegramService:
             return {"success": False, "error": "Telegram service not configured"}
         
         try:
-            logger.info(f"Sending message to Telegram channel: {self.channel_id}")
+            logger.info("Sending message to Telegram channel: %s", self.channel_id)
             
             # Determine parse mode
             pm = None
@@ -175,11 +285,11 @@ class TelegramService:
                 disable_web_page_preview=False
             )
             
-            logger.info(f"Telegram message sent successfully. Message ID: {sent_message.message_id}")
+            logger.info("Telegram message sent successfully. Message ID: %s", sent_message.message_id)
             return {"success": True, "message_id": sent_message.message_id}
         
         except Exception as e:
-            logger.error(f"Error sending Telegram message: {str(e)}")
+            logger.error("Error sending Telegram message: %s", e)
             return {"success": False, "error": str(e)}
     
     async def send_photo_with_caption(self, photo_url: str, caption: str) -> dict:
@@ -204,11 +314,11 @@ class TelegramService:
                 parse_mode=ParseMode.MARKDOWN_V2
             )
             
-            logger.info(f"Telegram photo sent successfully. Message ID: {sent_message.message_id}")
+            logger.info("Telegram photo sent successfully. Message ID: %s", sent_message.message_id)
             return {"success": True, "message_id": sent_message.message_id}
         
         except Exception as e:
-            logger.error(f"Error sending Telegram photo: {str(e)}")
+            logger.error("Error sending Telegram photo: %s", e)
             return {"success": False, "error": str(e)}
     
     async def post_job(self, job: JobPosting) -> dict:
@@ -227,22 +337,20 @@ class TelegramService:
         message = self.format_job_message(job)
         
         if job.jobImageUrl:
-            # Convert Cloudinary path to full URL if needed
             image_url = job.jobImageUrl
-            if not image_url.startswith(('http://', 'https://')):
-                # It's a Cloudinary path, convert to full URL with auto format
-                # Adding f_auto,q_auto for format detection and .jpg extension for Telegram compatibility
-                image_url = f"https://res.cloudinary.com/dqxfwbv1j/image/upload/f_auto,q_auto/{job.jobImageUrl}.jpg"
-            elif 'cloudinary.com' in image_url and not any(image_url.endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
+            if not image_url.startswith(_URL_SCHEMES):
+                # Cloudinary path: prefix carries f_auto,q_auto; .jpg for Telegram compatibility
+                image_url = self.settings.cloudinary_image_base_url + image_url + ".jpg"
+            elif 'cloudinary.com' in image_url and not image_url.endswith(_IMAGE_EXTENSIONS):
                 # Cloudinary URL without extension - add .jpg for Telegram
-                image_url = f"{image_url}.jpg"
+                image_url += ".jpg"
             
             # Send with image
             result = await self.send_photo_with_caption(image_url, message)
             
             # If image fails, try sending as text only
             if not result.get("success"):
-                logger.warning(f"Photo failed, sending as text: {result.get('error')}")
+                logger.warning("Photo failed, sending as text: %s", result.get("error"))
                 return await self.send_to_channel(message)
             return result
         else:
@@ -264,7 +372,7 @@ class TelegramService:
             }
         
         except Exception as e:
-            logger.error(f"Error getting channel info: {str(e)}")
+            logger.error("Error getting channel info: %s", e)
             return {"error": str(e)}
     
     async def get_bot_info(self) -> dict:
@@ -283,5 +391,11 @@ class TelegramService:
             }
         
         except Exception as e:
-            logger.error(f"Error getting bot info: {str(e)}")
+            logger.error("Error getting bot info: %s", e)
             return {"error": str(e)}
+    
+    async def close(self):
+        """Close the Telegram HTTP connection pool"""
+        if self._request:
+            await self._request.shutdown()
+            logger.info("Telegram connection pool closed")
@@ -30,12 +30,12 @@ async def main():
     print(f"  REDIS_URL: {'✅ Set' if os.getenv('REDIS_URL') else '❌ Not set'}")
     print("=" * 60)
     
-    from app.services.supabase_service import SupabaseService
-    from app.services.telegram_service import TelegramService
+    from app.config import get_settings
+    from app.services import get_supabase_service, get_telegram_service
     
-    # Check services
-    supabase_service = SupabaseService()
-    telegram_service = TelegramService()
+    # Check services (one shared instance each, reusing their connection pools)
+    supabase_service = get_supabase_service()
+    telegram_service = get_telegram_service()
     
     print(f"\nService Status:")
     print(f"  Supabase configured: {supabase_service.is_configured()}")
@@ -64,39 +64,58 @@ async def main():
         print("  1. No published jobs in the database in the last 7 days")
         print("  2. All jobs have already been shared (tracked in Redis)")
         
-        # Let's check if there are ANY jobs
-        print("\nChecking for any published jobs...")
-        all_jobs = await supabase_service.get_new_published_jobs(since=datetime.now(timezone.utc) - timedelta(days=365))
-        print(f"Total published jobs in last year: {len(all_jobs)}")
+        # Checking for ANY jobs fetches a whole year, so only do it when debugging
+        if os.getenv("FLEXITASK_DEBUG") == "1":
+            print("\nChecking for any published jobs...")
+            all_jobs = await supabase_service.get_new_published_jobs(since=datetime.now(timezone.utc) - timedelta(days=365))
+            print(f"Total published jobs in last year: {len(all_jobs)}")
         
         await supabase_service.close()
+        await telegram_service.close()
         return
     
-    # Try to share the first job as a test
+    # Share up to 5 jobs per run
     print(f"\nSharing jobs to Telegram...")
     
-    for job in jobs[:5]:  # Share up to 5 jobs
+    # Post concurrently, bounded like the server's posting paths
+    semaphore = asyncio.Semaphore(get_settings().telegram_max_concurrent_posts)
+    
+    async def post_one(job):
+        async with semaphore:
+            return await telegram_service.post_job(job)
+    
+    # Skip jobs another run is already posting
+    claimed = await supabase_service.claim_jobs_for_share([job.id for job in jobs[:5]]) or set()
+    batch = [job for job in jobs[:5] if job.id in claimed]
+    results = await asyncio.gather(*(post_one(job) for job in batch), return_exceptions=True)
+    
+    # Record every successful post in one batch
+    await supabase_service.mark_jobs_as_shared_bulk([
+        {
+            "job_id": job.id,
+            "telegram_shared": True,
+            "telegram_message_id": result.get("message_id")
+        }
+        for job, result in zip(batch, results)
+        if not isinstance(result, BaseException) and result.get("success")
+    ])
+    
+    for job, result in zip(batch, results):
         print(f"\n  Job: {job.title}")
         print(f"  Company: {job.companyName}")
         print(f"  Slug: {job.slug}")
         
-        try:
-            result = await telegram_service.post_job(job)
-            print(f"  Result: {result}")
-            
-            if result.get("success"):
-                await supabase_service.mark_job_as_shared(
-                    job_id=job.id,
-                    telegram_shared=True,
-                    telegram_message_id=result.get("message_id")
-                )
-                print(f"  ✅ Shared successfully!")
-            else:
-                print(f"  ❌ Failed: {result.get('error')}")
-        except Exception as e:
-            print(f"  ❌ Exception: {e}")
+        if isinstance(result, BaseException):
+            print(f"  ❌ Exception: {result}")
             import traceback
-            traceback.print_exc()
+            traceback.print_exception(result)
+            continue
+        
+        print(f"  Result: {result}")
+        if result.get("success"):
+            print(f"  ✅ Shared successfully!")
+        else:
+            print(f"  ❌ Failed: {result.get('error')}")
     
     # Cleanup: Delete jobs older than 30 days
     print("\n" + "=" * 60)
@@ -115,6 +134,7 @@ async def main():
     print("=" * 60)
     
     await supabase_service.close()
+    await telegram_service.close()
     print("\n✅ Job check completed!")
 
 
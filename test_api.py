@@ -3,105 +3,162 @@
 Test script for the Social Media Automation Service
 """
 
+import argparse
+import atexit
+import functools
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Tuple
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    
+    def json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+    
+    def json_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    import json
+    
+    def json_loads(data: bytes) -> Any:
+        return json.loads(data)
+    
+    def json_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
 
 # API endpoint
 BASE_URL = "http://localhost:8000"
-
-# Test job data matching frontend form structure
-test_job_full = {
-    "title": "Senior Software Engineer",
-    "companyName": "TechCorp Inc.",
-    "workLocationType": "HYBRID",
-    "employmentType": "FULL_TIME",
-    "category": "IT & Software",
-    "country": "United States",
-    "city": "San Francisco",
-    "experienceYears": "TWO_PLUS",
-    "isInternship": False,
-    "linkedInApplyURL": "https://www.linkedin.com/jobs/view/123456789",
-    "uniqueDescription": "We are looking for an experienced software engineer to join our team. Must have strong Python and JavaScript skills.",
-    "jobImage": None
-}
-
-test_job_minimal = {
-    "title": "Full Stack Developer",
-    "companyName": "StartupXYZ",
-    "workLocationType": "REMOTE",
-    "employmentType": "FULL_TIME",
-    "linkedInApplyURL": "https://www.linkedin.com/jobs/view/987654321"
-}
-
-
-def test_root():
-    """Test root endpoint"""
-    print("\n1. Testing Root Endpoint...")
+ROOT_URL = BASE_URL + "/"
+HEALTH_URL = BASE_URL + "/health"
+STATS_URL = BASE_URL + "/api/stats"
+SCHEDULER_STATUS_URL = BASE_URL + "/api/scheduler/status"
+
+# One keep-alive session shared by every test
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    # Retry transient failures with exponential backoff before giving up;
+    # only GETs, since a POST may already have acted when the gateway timed out
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET"])
+    )
+))
+atexit.register(SESSION.close)
+
+# Print every response body, not only failures (--verbose)
+VERBOSE = False
+
+# A check performs one request and returns the response with its raw body
+CheckCall = Callable[[], Tuple[requests.Response, bytes]]
+
+# Checks run in parallel; each prints its whole block under this lock
+_print_lock = threading.Lock()
+
+
+def report(*lines: str) -> None:
+    """Write one check's output in a single call, without interleaving with other threads"""
+    buffer = io.StringIO()
+    for line in lines:
+        buffer.write(line)
+        buffer.write("\n")
+    with _print_lock:
+        sys.stdout.write(buffer.getvalue())
+
+
+def format_body(body: bytes) -> str:
+    """Pretty JSON, or the raw text for non-JSON bodies such as proxy error pages"""
     try:
-        response = requests.get(f"{BASE_URL}/")
-        print(f"✅ Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        return json_pretty(json_loads(body))
+    except ValueError:
+        return body.decode(errors="replace")
+
+
+def with_report(label: str) -> Callable[[CheckCall], Callable[[], None]]:
+    """Print a check's status (and JSON body on failure), or its error once retries are exhausted"""
+    def decorator(check: CheckCall) -> Callable[[], None]:
+        @functools.wraps(check)
+        def wrapper() -> None:
+            try:
+                response, body = check()
+                if response.ok and not VERBOSE:
+                    report(f"\n{label}...", f"✅ Status: {response.status_code} ({len(body)} B)")
+                else:
+                    report(
+                        f"\n{label}...",
+                        f"{'✅' if response.ok else '❌'} Status: {response.status_code}",
+                        f"Response: {format_body(body)}"
+                    )
+            except Exception as e:
+                report(f"\n{label}...", f"❌ Error: {str(e)}")
+        return wrapper
+    return decorator
+
+
+@with_report("1. Testing Root Endpoint")
+def check_root() -> Tuple[requests.Response, bytes]:
+    """Test root endpoint"""
+    response = SESSION.get(ROOT_URL)
+    return response, response.content
 
 
-def test_health():
+@with_report("2. Testing Health Endpoint")
+def check_health() -> Tuple[requests.Response, bytes]:
     """Test health endpoint"""
-    print("\n2. Testing Health Endpoint...")
-    try:
-        response = requests.get(f"{BASE_URL}/health")
-        print(f"✅ Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
+    response = SESSION.get(HEALTH_URL)
+    return response, response.content
 
 
-def test_post_job_full():
-    """Test job posting with all fields"""
-    print("\n3. Testing Job Posting (Full Details)...")
-    try:
-        response = requests.post(
-            f"{BASE_URL}/api/post-job",
-            json=test_job_full,
-            headers={"Content-Type": "application/json"}
-        )
-        print(f"✅ Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-
-
-def test_post_job_minimal():
-    """Test job posting with minimal required fields"""
-    print("\n4. Testing Job Posting (Minimal Fields)...")
-    try:
-        response = requests.post(
-            f"{BASE_URL}/api/post-job",
-            json=test_job_minimal,
-            headers={"Content-Type": "application/json"}
-        )
-        print(f"✅ Status: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-
-
-def main():
-    print("=" * 70)
-    print("Flexitask Social Media Automation - Test Script")
-    print("=" * 70)
+@with_report("3. Testing Stats Endpoint")
+def check_stats() -> Tuple[requests.Response, bytes]:
+    """Test sharing statistics endpoint"""
+    response = SESSION.get(STATS_URL)
+    return response, response.content
+
+
+@with_report("4. Testing Scheduler Status Endpoint")
+def check_scheduler_status() -> Tuple[requests.Response, bytes]:
+    """Test scheduler status endpoint"""
+    response = SESSION.get(SCHEDULER_STATUS_URL)
+    return response, response.content
+
+
+def main() -> None:
+    global VERBOSE
+    
+    parser = argparse.ArgumentParser(description="Smoke-test the FlexiTask Automation API")
+    parser.add_argument("--verbose", action="store_true", help="print every response body")
+    VERBOSE = parser.parse_args().verbose
+    
+    # Output is written in whole blocks, so skip per-line flushing
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+    
+    report(
+        "=" * 70,
+        "Flexitask Social Media Automation - Test Script",
+        "=" * 70
+    )
     
-    # Run tests
-    test_root()
-    test_health()
-    test_post_job_full()
-    test_post_job_minimal()
+    # Run checks concurrently over the shared session
+    checks = [check_root, check_health, check_stats, check_scheduler_status]
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        list(executor.map(lambda check: check(), checks))
     
-    print("\n" + "=" * 70)
-    print("✅ All tests completed!")
-    print("=" * 70)
-    print("\nNote: Check service logs to see if messages were sent:")
-    print("  docker-compose logs -f")
+    report(
+        "\n" + "=" * 70,
+        "✅ All tests completed!",
+        "=" * 70
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+"""
+Shared fixtures for the test suite
+
+Unit tests run offline against in-memory fakes. The `session` fixture is
+for the API smoke tests: they run against a live server (BASE_URL in
+test_api.py) and are skipped when it isn't reachable.
+"""
+
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+import requests
+from redis import ResponseError
+
+# Add the project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test_api import SESSION, BASE_URL, ROOT_URL
+
+
+class FakePipeline:
+    """Records queued commands and replays them on FakeRedis at execute()"""
+    
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: List[Tuple[str, tuple, Dict[str, Any]]] = []
+    
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+    
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        if self.redis.error is not None:
+            raise self.redis.error
+        self.redis.pipelines.append(self.commands)
+        results = []
+        for name, args, kwargs in self.commands:
+            try:
+                results.append(await getattr(self.redis, name)(*args, **kwargs))
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        return results
+
+
+class FakeRedis:
+    """
+    Minimal in-memory stand-in for redis.asyncio.Redis
+    
+    Supports only the commands the services use. Set `error` to make every
+    call and pipeline fail with that exception.
+    """
+    
+    def __init__(self):
+        self.strings: Dict[str, str] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.ttls: Dict[str, int] = {}
+        self.pipelines: List[list] = []
+        self.error: Optional[Exception] = None
+    
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+    
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+    
+    async def set(self, key: str, value: str, nx: bool = False, ex: Optional[int] = None):
+        self._check()
+        if nx and (key in self.strings or key in self.hashes):
+            return None
+        self.strings[key] = value
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+    
+    async def get(self, key: str) -> Optional[str]:
+        self._check()
+        if key in self.hashes:
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return self.strings.get(key)
+    
+    async def exists(self, key: str) -> int:
+        self._check()
+        return int(key in self.strings or key in self.hashes)
+    
+    async def hgetall(self, key: str) -> Dict[str, str]:
+        self._check()
+        if key in self.strings:
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return dict(self.hashes.get(key, {}))
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture(scope="module")
+def session() -> requests.Session:
+    """The shared keep-alive session, once the API server is known to be reachable"""
+    try:
+        SESSION.get(ROOT_URL)
+    except requests.ConnectionError:
+        pytest.skip(f"API server not reachable at {BASE_URL}")
+    return SESSION
@@ -0,0 +1,44 @@
+"""
+Smoke tests for the FlexiTask Automation API routes
+
+Run with `pytest tests` (optionally `-n auto` with pytest-xdist) while the
+server is running.
+"""
+
+import pytest
+import requests
+
+from test_api import BASE_URL, ROOT_URL, HEALTH_URL, json_loads
+
+
+@pytest.mark.parametrize("url", [ROOT_URL, HEALTH_URL], ids=["root", "health"])
+def test_health_endpoints(session: requests.Session, url: str) -> None:
+    response = session.get(url)
+    assert response.status_code == 200
+    assert json_loads(response.content)["status"] in ("running", "healthy")
+
+
+def test_new_jobs(session: requests.Session) -> None:
+    # The route answers 503 without Supabase, which the session would retry
+    health = json_loads(session.get(HEALTH_URL).content)
+    if not health["services"]["supabase"]["configured"]:
+        pytest.skip("Supabase not configured on the server")
+    
+    response = session.get(f"{BASE_URL}/api/jobs/new", params={"hours": 1})
+    assert response.status_code == 200
+    body = json_loads(response.content)
+    assert body["count"] == len(body["jobs"])
+
+
+def test_stats(session: requests.Session) -> None:
+    response = session.get(f"{BASE_URL}/api/stats")
+    assert response.status_code == 200
+    assert "total_jobs_shared" in json_loads(response.content)
+
+
+def test_preview_unknown_job(session: requests.Session) -> None:
+    response = session.post(
+        f"{BASE_URL}/api/preview/telegram",
+        params={"job_id": "00000000-0000-0000-0000-000000000000"}
+    )
+    assert response.status_code == 404
@@ -0,0 +1,142 @@
+"""
+Unit tests for the scheduler's polling backoff and checkpoint handling
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app import scheduler
+from app.models import JobPosting
+
+LAST_CHECK = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_job(index: int) -> JobPosting:
+    return JobPosting(
+        id=str(index),
+        title=f"Job {index}",
+        slug=f"job-{index}",
+        companyName="Acme",
+        employmentType="FULL_TIME",
+        workLocationType="REMOTE",
+        linkedInApplyURL="https://example.com/apply",
+        createdAt=LAST_CHECK + timedelta(minutes=index)
+    )
+
+
+class FakeSupabaseService:
+    """Serves a fixed set of jobs and records the checkpoint it is given"""
+    
+    def __init__(self, jobs: List[JobPosting], claimable: Optional[set] = None):
+        self.jobs = jobs
+        self.claimable = claimable
+        self.checkpoint: Optional[datetime] = None
+    
+    def is_configured(self) -> bool:
+        return True
+    
+    async def get_last_check_timestamp(self) -> datetime:
+        return LAST_CHECK
+    
+    async def get_new_published_jobs(self, since: Optional[datetime] = None) -> List[JobPosting]:
+        return list(self.jobs)
+    
+    async def claim_jobs_for_share(self, job_ids: List[str]) -> Optional[set]:
+        return self.claimable if self.claimable is None else set(job_ids) & self.claimable
+    
+    async def mark_job_as_shared(self, **kwargs) -> bool:
+        return True
+    
+    async def set_last_check_timestamp(self, timestamp: Optional[datetime] = None) -> bool:
+        self.checkpoint = timestamp
+        return True
+
+
+class FakeTelegramService:
+    """Posts every job except the ones listed in `failing`"""
+    
+    def __init__(self, failing: set = frozenset()):
+        self.failing = failing
+    
+    def is_configured(self) -> bool:
+        return True
+    
+    async def post_job(self, job: JobPosting) -> Dict[str, Any]:
+        if job.id in self.failing:
+            raise RuntimeError("boom")
+        return {"success": True, "message_id": 1}
+
+
+@pytest.fixture
+def polling(monkeypatch):
+    """Start the backoff from a 1s base with a 10s ceiling"""
+    monkeypatch.setattr(scheduler.settings, "polling_interval_seconds", 1)
+    monkeypatch.setattr(scheduler.settings, "max_polling_interval_seconds", 10)
+    monkeypatch.setattr(scheduler, "_current_interval", 1)
+
+
+def test_backoff_grows_from_small_base(polling) -> None:
+    intervals = []
+    for _ in range(6):
+        scheduler._adjust_polling_interval(found_jobs=False)
+        intervals.append(scheduler._current_interval)
+    
+    assert intervals == [2, 3, 5, 8, 10, 10]
+
+
+def test_backoff_resets_when_jobs_appear(polling) -> None:
+    scheduler._adjust_polling_interval(found_jobs=False)
+    scheduler._adjust_polling_interval(found_jobs=True)
+    
+    assert scheduler._current_interval == 1
+
+
+def test_next_checkpoint() -> None:
+    started = LAST_CHECK + timedelta(hours=1)
+    
+    assert scheduler.next_checkpoint(started, []) == started
+    assert scheduler.next_checkpoint(started, [make_job(3), make_job(1)]) == make_job(1).createdAt
+
+
+def run_check(monkeypatch, supabase: FakeSupabaseService, telegram: FakeTelegramService) -> Dict[str, Any]:
+    monkeypatch.setattr(scheduler, "get_supabase_service", lambda: supabase)
+    monkeypatch.setattr(scheduler, "get_telegram_service", lambda: telegram)
+    return asyncio.run(scheduler.check_and_share_new_jobs())
+
+
+def test_checkpoint_advances_when_all_jobs_share(monkeypatch) -> None:
+    supabase = FakeSupabaseService([make_job(i) for i in range(3)], claimable={"0", "1", "2"})
+    
+    result = run_check(monkeypatch, supabase, FakeTelegramService())
+    
+    assert result["jobs_shared"] == 3
+    assert supabase.checkpoint > LAST_CHECK + timedelta(minutes=2)
+
+
+def test_checkpoint_holds_at_failed_post(monkeypatch) -> None:
+    supabase = FakeSupabaseService([make_job(i) for i in range(3)], claimable={"0", "1", "2"})
+    
+    result = run_check(monkeypatch, supabase, FakeTelegramService(failing={"1"}))
+    
+    assert result["jobs_shared"] == 2
+    assert supabase.checkpoint == make_job(1).createdAt
+
+
+def test_checkpoint_holds_at_unclaimed_job(monkeypatch) -> None:
+    supabase = FakeSupabaseService([make_job(i) for i in range(3)], claimable={"0", "2"})
+    
+    run_check(monkeypatch, supabase, FakeTelegramService())
+    
+    assert supabase.checkpoint == make_job(1).createdAt
+
+
+def test_checkpoint_holds_when_claiming_fails(monkeypatch) -> None:
+    supabase = FakeSupabaseService([make_job(i) for i in range(3)], claimable=None)
+    
+    result = run_check(monkeypatch, supabase, FakeTelegramService())
+    
+    assert result["jobs_processed"] == 0
+    assert supabase.checkpoint == make_job(0).createdAt
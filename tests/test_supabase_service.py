@@ -0,0 +1,112 @@
+"""
+Unit tests for SupabaseService's Redis tracking, run against FakeRedis
+"""
+
+import asyncio
+import json
+
+import pytest
+from redis import ConnectionError as RedisConnectionError
+
+from app.models import JobPosting
+from app.services.supabase_service import (
+    SHARE_CLAIM_SECONDS_PER_JOB,
+    SHARE_CLAIM_TTL_SECONDS,
+    SupabaseService
+)
+
+
+@pytest.fixture
+def service(fake_redis) -> SupabaseService:
+    service = SupabaseService()
+    service.redis = fake_redis
+    return service
+
+
+def test_claim_returns_only_unclaimed_jobs(service, fake_redis) -> None:
+    fake_redis.strings["share_claim:b"] = "1"
+    
+    claimed = asyncio.run(service.claim_jobs_for_share(["a", "b", "c"]))
+    
+    assert claimed == {"a", "c"}
+    assert len(fake_redis.pipelines) == 1
+
+
+def test_claim_ttl_scales_with_batch_size(service, fake_redis) -> None:
+    job_ids = [str(i) for i in range(100)]
+    
+    asyncio.run(service.claim_jobs_for_share(job_ids))
+    
+    expected = SHARE_CLAIM_TTL_SECONDS + 100 * SHARE_CLAIM_SECONDS_PER_JOB
+    assert {fake_redis.ttls[f"share_claim:{job_id}"] for job_id in job_ids} == {expected}
+
+
+def test_claim_signals_redis_errors(service, fake_redis) -> None:
+    fake_redis.error = RedisConnectionError("down")
+    
+    assert asyncio.run(service.claim_jobs_for_share(["a"])) is None
+
+
+def test_claim_nothing(service, fake_redis) -> None:
+    assert asyncio.run(service.claim_jobs_for_share([])) == set()
+    assert fake_redis.pipelines == []
+
+
+def test_shared_job_ids_are_cached(service, fake_redis) -> None:
+    fake_redis.hashes["shared_job:a"] = {"job_id": "a"}
+    
+    assert asyncio.run(service._get_shared_job_ids(["a", "b"])) == {"a"}
+    # "a" is now answered from memory; only "b" is looked up again
+    asyncio.run(service._get_shared_job_ids(["a", "b"]))
+    assert fake_redis.pipelines[-1] == [("exists", ("shared_job:b",), {})]
+
+
+def test_shared_job_ids_fail_open_to_the_cache(service, fake_redis) -> None:
+    service._shared_cache["a"] = True
+    fake_redis.error = RedisConnectionError("down")
+    
+    assert asyncio.run(service._get_shared_job_ids(["a", "b"])) == {"a"}
+
+
+def test_shared_job_info_decodes_hash(service, fake_redis) -> None:
+    fake_redis.hashes["shared_job:a"] = {
+        "job_id": "a",
+        "shared_at": "2026-01-01T00:00:00+00:00",
+        "telegram_shared": "1",
+        "telegram_message_id": "42",
+        "error_message": ""
+    }
+    
+    assert asyncio.run(service.get_shared_job_info("a")) == {
+        "job_id": "a",
+        "shared_at": "2026-01-01T00:00:00+00:00",
+        "telegram_shared": True,
+        "telegram_message_id": 42,
+        "error_message": None
+    }
+
+
+def test_shared_job_info_reads_legacy_json(service, fake_redis) -> None:
+    legacy = {"job_id": "a", "telegram_shared": True, "telegram_message_id": 7}
+    fake_redis.strings["shared_job:a"] = json.dumps(legacy)
+    
+    assert asyncio.run(service.get_shared_job_info("a")) == legacy
+
+
+def test_from_supabase_row_maps_relations() -> None:
+    job = JobPosting.from_supabase_row({
+        "id": "a",
+        "title": "Engineer",
+        "slug": "engineer",
+        "companyName": "Acme",
+        "employmentType": "FULL_TIME",
+        "workLocationType": "REMOTE",
+        "linkedInApplyURL": "https://example.com/apply",
+        "job_categories": {"id": "c1", "name": "IT & Software", "slug": "it"},
+        "countries": {"id": "lk", "name": "Sri Lanka", "code": "LK"},
+        "cities": None
+    })
+    
+    assert job.category.name == "IT & Software"
+    assert job.country.code == "LK"
+    assert job.city is None
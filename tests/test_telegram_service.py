@@ -0,0 +1,72 @@
+"""
+Unit tests for the Telegram MarkdownV2 job message
+"""
+
+from typing import Any, Dict
+
+from app.services.telegram_service import _escape_markdown, _format_job_message_cached
+
+JOB_SITE_URL = "https://jobs.example.com"
+
+
+def format_message(**overrides: Any) -> str:
+    fields: Dict[str, Any] = {
+        "title": "Senior Engineer (Python)",
+        "company_name": "Acme Inc.",
+        "city": "Colombo",
+        "country": "Sri Lanka",
+        "employment_type": "FULL_TIME",
+        "work_location_type": "HYBRID",
+        "category": None,
+        "experience_years": None,
+        "is_internship": False,
+        "description": None,
+        "slug": "senior-engineer",
+        "job_site_url": JOB_SITE_URL
+    }
+    fields.update(overrides)
+    return _format_job_message_cached(**fields)
+
+
+def test_escape_markdown() -> None:
+    assert _escape_markdown("C# (v1.0) - 50% off!") == "C\\# \\(v1\\.0\\) \\- 50% off\\!"
+
+
+def test_message_escapes_fields_and_maps_labels() -> None:
+    message = format_message()
+    
+    assert "📌 *Senior Engineer \\(Python\\)* at _Acme Inc\\._\n" in message
+    assert "📍 Colombo, Sri Lanka \\| Hybrid\n" in message
+    assert "💼 Full Time\n" in message
+    assert f"👉 [Apply Now]({JOB_SITE_URL}/jobs/senior-engineer)" in message
+
+
+def test_message_omits_missing_optional_lines() -> None:
+    message = format_message(city=None, country=None)
+    
+    assert "📍 Location not specified" in message
+    assert "🏷️" not in message
+    assert "📊" not in message
+    assert "🎓" not in message
+    assert message.endswith("\\#Jobs \\#Hiring \\#FlexiTask")
+
+
+def test_message_optional_lines_and_hashtags() -> None:
+    message = format_message(
+        category="IT & Software",
+        experience_years="TWO_PLUS",
+        is_internship=True,
+        work_location_type="REMOTE"
+    )
+    
+    assert "🏷️ IT & Software\n" in message
+    assert "📊 Experience: 2\\+ years\n" in message
+    assert "🎓 *Internship Position*\n" in message
+    assert message.endswith("\\#Jobs \\#ITAndSoftware \\#Hiring \\#FlexiTask \\#RemoteJobs")
+
+
+def test_message_truncates_long_descriptions() -> None:
+    message = format_message(description="a" * 250)
+    
+    assert f"\n{'a' * 200}…\n" in message
+    assert "a" * 201 not in message